@@ -1,12 +1,14 @@
 import pandas as pd
-from typing import Dict, List, Union, Optional
+from typing import Dict, List, Tuple, Union, Optional
 
 from vantage6.algorithm.client import AlgorithmClient
 from vantage6.algorithm.tools.util import info
 from vantage6.algorithm.tools.decorators import algorithm_client
-from vantage6.algorithm.tools.exceptions import PrivacyThresholdViolation
+from vantage6.algorithm.tools.exceptions import InputError, PrivacyThresholdViolation
+from .curve import KaplanMeierCurve
 from .types import (
     NoiseType,
+    ResultFormat,
     DEFAULT_INTERVAL_START_COLUMN,
     DEFAULT_CUMULATIVE_INCIDENCE_COLUMN,
     MINIMUM_ORGANIZATIONS
@@ -19,19 +21,42 @@ def kaplan_meier_central(
     noise_type: NoiseType = NoiseType.NONE,
     snr: Optional[float] = None,
     random_seed: Optional[int] = None,
-) -> Dict[str, Union[str, List[str]]]:
+    per_database: bool = False,
+    noise_configurations: Optional[List[Dict]] = None,
+    result_format: ResultFormat = ResultFormat.TABLE,
+    landmark_times: Optional[List[float]] = None,
+    quantiles: Optional[List[float]] = None,
+) -> Union[str, Dict]:
     """
     Central orchestration of the federated Kaplan-Meier algorithm with interval censoring.
     This function uses hyperparameters for column names defined in types.py and calls the preprocessing
     functions automatically before executing the partial tasks.
+
+    Nodes load every database requested for the task. By default their counts are pooled;
+    with `per_database` set, the nodes return one event table per database and a curve is
+    also computed for each database label across all organizations.
+
+    `noise_configurations` runs a sweep over several noise settings within the same two
+    rounds. Each entry is a dict with `noise_type`, `snr`, `random_seed` and an optional
+    `name`; it cannot be combined with the top-level noise arguments.
+
+    `result_format` selects what is returned for each curve: the full event table ("TABLE"),
+    only the step function of the cumulative incidence ("CURVE", a dict with `times` and
+    `cumulative_incidence`), or only a summary at `landmark_times` (in months) with the
+    times at which the cumulative incidence reaches `quantiles` ("LANDMARKS").
     
     Returns
     -------
-    dict
+    str or dict
         The aggregated Kaplan-Meier event table as a JSON table with columns:
       - interval_start
       - removed, observed, interval, censored, at_risk, hazard
       - cumulative_incidence
+        or the compact curve / landmark summary requested with `result_format`.
+        With `per_database`, a dict with the pooled table under "pooled" and a dict
+        mapping each database label to its table under "per_database".
+        With `noise_configurations`, a dict mapping each configuration name (by default
+        "<noise_type>_snr=<snr>_seed=<random_seed>") to the result described above.
     """
     if not organizations_to_include:
         organizations_to_include = [org["id"] for org in client.organization.list()]
@@ -39,19 +64,36 @@ def kaplan_meier_central(
     if len(organizations_to_include) < MINIMUM_ORGANIZATIONS:
         raise PrivacyThresholdViolation(f"Minimum number of organizations not met (required: {MINIMUM_ORGANIZATIONS}).")
 
+    try:
+        result_format = ResultFormat(result_format)
+    except ValueError:
+        raise InputError(f"Unknown result format: {result_format}")
+    if result_format == ResultFormat.LANDMARKS and not (landmark_times or quantiles):
+        raise InputError("'landmark_times' or 'quantiles' must be provided for the landmarks result format.")
+    format_kwargs = {"result_format": result_format, "landmark_times": landmark_times, "quantiles": quantiles}
+
+    if noise_configurations is None:
+        noise_kwargs = {"noise_type": noise_type, "snr": snr, "random_seed": random_seed}
+    else:
+        if noise_type not in (None, NoiseType.NONE) or snr is not None or random_seed is not None:
+            raise InputError("'noise_type', 'snr' and 'random_seed' cannot be combined with 'noise_configurations'.")
+        names, noise_configurations = _validate_noise_configurations(noise_configurations)
+        noise_kwargs = {"noise_configurations": noise_configurations}
+
     info("Step 1: Collecting unique event times.")
     unique_event_times_results = _start_partial_and_collect_results(
         client,
         method="get_unique_event_times",
         organizations_to_include=organizations_to_include,
-        noise_type=noise_type,
-        snr=snr,
-        random_seed=random_seed,
+        **noise_kwargs,
     )
-    unique_event_times = set()
-    for result in unique_event_times_results:
-        unique_event_times.update(result)
-    unique_event_times = sorted(unique_event_times)
+    if noise_configurations is None:
+        unique_event_times = _merge_unique_event_times(unique_event_times_results)
+    else:
+        unique_event_times = [
+            _merge_unique_event_times([result[i] for result in unique_event_times_results])
+            for i in range(len(noise_configurations))
+        ]
 
     info("Step 2: Collecting local event tables.")
     local_event_tables_results = _start_partial_and_collect_results(
@@ -59,19 +101,104 @@ def kaplan_meier_central(
         method="get_km_event_table",
         organizations_to_include=organizations_to_include,
         unique_event_times=unique_event_times,
-        noise_type=noise_type,
-        snr=snr,
-        random_seed=random_seed,
+        per_database=per_database,
+        **noise_kwargs,
     )
-    local_event_tables = [pd.read_json(result) for result in local_event_tables_results]
 
     info("Step 3: Aggregating local event tables.")
-    km_df = pd.concat(local_event_tables).groupby(DEFAULT_INTERVAL_START_COLUMN, as_index=False).sum()
-    km_df["hazard"] = (km_df["observed"] + km_df["interval"] * 0.5) / km_df["at_risk"]
-    km_df[DEFAULT_CUMULATIVE_INCIDENCE_COLUMN] = 1 - (1 - km_df["hazard"]).cumprod()
+    if noise_configurations is None:
+        return _aggregate_results(local_event_tables_results, per_database, **format_kwargs)
+    return {
+        name: _aggregate_results([result[i] for result in local_event_tables_results], per_database, **format_kwargs)
+        for i, name in enumerate(names)
+    }
+
+def _validate_noise_configurations(noise_configurations: List[Dict]) -> Tuple[List[str], List[Dict]]:
+    """
+    Check the noise configurations of a sweep and split them into unique names and the
+    noise arguments that are sent to the nodes.
+    """
+    if not noise_configurations:
+        raise InputError("'noise_configurations' must contain at least one configuration.")
+
+    names, configurations = [], []
+    for config in noise_configurations:
+        if not isinstance(config, dict):
+            raise InputError(f"Noise configurations must be dicts, got: {config!r}.")
+        unknown = set(config) - {"name", "noise_type", "snr", "random_seed"}
+        if unknown:
+            raise InputError(f"Unknown keys in noise configuration: {sorted(unknown)}.")
+        try:
+            noise_type = NoiseType(config.get("noise_type", NoiseType.NONE))
+        except ValueError:
+            raise InputError(f"Unknown noise type: {config.get('noise_type')}")
+        snr = config.get("snr")
+        if noise_type == NoiseType.GAUSSIAN and (snr is None or snr <= 0):
+            raise InputError("For Gaussian noise, 'snr' must be provided and > 0.")
+        random_seed = config.get("random_seed")
+        names.append(config.get("name") or f"{noise_type.value}_snr={snr}_seed={random_seed}")
+        configurations.append({"noise_type": noise_type, "snr": snr, "random_seed": random_seed})
 
-    info("Kaplan-Meier curve with interval censoring computed.")
-    return km_df.to_json()
+    if len(set(names)) != len(names):
+        raise InputError("Noise configurations must have unique names.")
+    return names, configurations
+
+def _merge_unique_event_times(results: List[List[float]]) -> List[float]:
+    unique_event_times = set()
+    for result in results:
+        unique_event_times.update(result)
+    return sorted(unique_event_times)
+
+def _aggregate_results(
+    local_event_tables_results: List[Union[str, Dict[str, str]]],
+    per_database: bool,
+    **format_kwargs,
+) -> Union[str, Dict]:
+    """
+    Aggregate the event tables of all organizations into the pooled curve and, with
+    `per_database`, one curve per database label.
+    """
+    if not per_database:
+        km_df = _aggregate_event_tables([pd.read_json(result) for result in local_event_tables_results])
+        info("Kaplan-Meier curve with interval censoring computed.")
+        return _format_result(km_df, **format_kwargs)
+
+    database_tables: Dict[str, List[pd.DataFrame]] = {}
+    for result in local_event_tables_results:
+        for label, table in result.items():
+            database_tables.setdefault(label, []).append(pd.read_json(table))
+    km_df = _aggregate_event_tables([table for tables in database_tables.values() for table in tables])
+    info(f"Kaplan-Meier curves with interval censoring computed (pooled and {len(database_tables)} databases).")
+    return {
+        "pooled": _format_result(km_df, **format_kwargs),
+        "per_database": {
+            label: _format_result(_aggregate_event_tables(tables), **format_kwargs)
+            for label, tables in database_tables.items()
+        },
+    }
+
+def _format_result(
+    km_df: pd.DataFrame,
+    result_format: ResultFormat,
+    landmark_times: Optional[List[float]],
+    quantiles: Optional[List[float]],
+) -> Union[str, Dict]:
+    if result_format == ResultFormat.TABLE:
+        return km_df.to_json()
+    curve = KaplanMeierCurve.from_table(km_df)
+    if result_format == ResultFormat.CURVE:
+        return curve.to_dict()
+    return curve.landmarks(landmark_times or [], quantiles)
+
+def _aggregate_event_tables(event_tables: List[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Sum local event tables per unique event time and compute hazard and cumulative incidence.
+    Times without anyone at risk (possible for a single database) get a hazard of zero.
+    """
+    km_df = pd.concat(event_tables).groupby(DEFAULT_INTERVAL_START_COLUMN, as_index=False).sum()
+    km_df["hazard"] = ((km_df["observed"] + km_df["interval"] * 0.5) / km_df["at_risk"]).fillna(0)
+    km_df[DEFAULT_CUMULATIVE_INCIDENCE_COLUMN] = 1 - (1 - km_df["hazard"]).cumprod()
+    return km_df
 
 def _start_partial_and_collect_results(
     client: AlgorithmClient,
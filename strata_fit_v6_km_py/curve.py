@@ -0,0 +1,120 @@
+"""
+Compact step-function representation of a Kaplan-Meier cumulative incidence curve.
+"""
+
+from io import StringIO
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .types import DEFAULT_INTERVAL_START_COLUMN, DEFAULT_CUMULATIVE_INCIDENCE_COLUMN
+
+ArrayLike = Union[float, List[float], np.ndarray]
+
+
+class KaplanMeierCurve:
+    """
+    Right-continuous step function of the cumulative incidence over time (in months
+    from diagnosis). Only the times at which the cumulative incidence changes are
+    stored, so point queries and quantiles are binary searches over two sorted arrays.
+
+    Parameters:
+        times (array-like): Strictly increasing times of the steps.
+        cumulative_incidence (array-like): Non-decreasing cumulative incidence reached
+                                           at each time.
+    """
+
+    def __init__(self, times: ArrayLike, cumulative_incidence: ArrayLike):
+        times = np.asarray(times, dtype=float)
+        cumulative_incidence = np.asarray(cumulative_incidence, dtype=float)
+        if times.shape != cumulative_incidence.shape or times.ndim != 1:
+            raise ValueError("'times' and 'cumulative_incidence' must be 1-D arrays of the same length.")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("'times' must be strictly increasing.")
+        if np.any(np.diff(cumulative_incidence) < 0):
+            raise ValueError("'cumulative_incidence' must be non-decreasing.")
+        self.times = times
+        self.cumulative_incidence = cumulative_incidence
+
+    @classmethod
+    def from_table(cls, km_df: pd.DataFrame) -> "KaplanMeierCurve":
+        """
+        Build a curve from the aggregated event table, dropping rows at which the
+        cumulative incidence does not change.
+        """
+        km_df = km_df.sort_values(DEFAULT_INTERVAL_START_COLUMN)
+        times = km_df[DEFAULT_INTERVAL_START_COLUMN].to_numpy(dtype=float)
+        cumulative_incidence = km_df[DEFAULT_CUMULATIVE_INCIDENCE_COLUMN].to_numpy(dtype=float)
+        keep = np.ones(len(times), dtype=bool)
+        keep[1:] = cumulative_incidence[1:] != cumulative_incidence[:-1]
+        return cls(times[keep], cumulative_incidence[keep])
+
+    @classmethod
+    def from_result(cls, result: Union[str, Dict]) -> "KaplanMeierCurve":
+        """
+        Build a curve from a result of `kaplan_meier_central`: either the full JSON
+        event table or the compact dict returned for `result_format="CURVE"`.
+        """
+        if isinstance(result, dict):
+            return cls(result["times"], result["cumulative_incidence"])
+        return cls.from_table(pd.read_json(StringIO(result)))
+
+    def to_dict(self) -> Dict[str, List[float]]:
+        return {
+            "times": self.times.tolist(),
+            "cumulative_incidence": self.cumulative_incidence.tolist(),
+        }
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def __call__(self, times: ArrayLike) -> Union[float, np.ndarray]:
+        """
+        Cumulative incidence at the given time(s); zero before the first step and NaN
+        for NaN times.
+        """
+        times = np.asarray(times, dtype=float)
+        if not len(self):
+            values = np.where(np.isnan(times), np.nan, 0.0)
+            return values if values.ndim else float(values)
+        index = np.searchsorted(self.times, times, side="right") - 1
+        values = np.where(index >= 0, self.cumulative_incidence[np.maximum(index, 0)], 0.0)
+        values = np.where(np.isnan(times), np.nan, values)
+        return values if values.ndim else float(values)
+
+    def quantile(self, q: ArrayLike) -> Union[float, np.ndarray]:
+        """
+        Earliest time at which the cumulative incidence reaches `q`, or NaN if it never does
+        (or `q` is NaN). Any `q <= 0` is reached at the start of follow-up, time 0.
+        """
+        q = np.asarray(q, dtype=float)
+        if not len(self):
+            values = np.where(q <= 0, 0.0, np.nan)
+            return values if values.ndim else float(values)
+        index = np.searchsorted(self.cumulative_incidence, q, side="left")
+        found = index < len(self.times)
+        values = np.where(found, self.times[np.minimum(index, len(self.times) - 1)], np.nan)
+        values = np.where(q <= 0, 0.0, values)
+        values = np.where(np.isnan(q), np.nan, values)
+        return values if values.ndim else float(values)
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def landmarks(self, times: ArrayLike, quantiles: Optional[ArrayLike] = None) -> Dict[str, List[Optional[float]]]:
+        """
+        Summary of the cumulative incidence at the landmark `times` and, optionally,
+        the times at which the given `quantiles` are reached (None if never reached).
+        """
+        times = np.atleast_1d(np.asarray(times, dtype=float))
+        summary = {
+            "times": times.tolist(),
+            "cumulative_incidence": np.atleast_1d(self(times)).tolist(),
+        }
+        if quantiles is not None:
+            quantiles = np.atleast_1d(np.asarray(quantiles, dtype=float))
+            quantile_times = np.atleast_1d(self.quantile(quantiles))
+            summary["quantiles"] = quantiles.tolist()
+            summary["quantile_times"] = [None if np.isnan(t) else t for t in quantile_times.tolist()]
+        return summary
@@ -1,6 +1,7 @@
+import os
 import pandas as pd
 import numpy as np
-from typing import List, Optional
+from typing import Dict, List, Optional, Union
 from vantage6.algorithm.tools.util import info
 from vantage6.algorithm.tools.decorators import data
 from vantage6.algorithm.tools.exceptions import InputError
@@ -14,57 +15,159 @@ from .types import (
 from .utils import add_noise_to_event_times
 from .preprocessing import strata_fit_data_to_km_input
 
-@data(1)
+
+def _requested_database_labels() -> List[str]:
+    return [label for label in os.environ.get("USER_REQUESTED_DATABASE_LABELS", "").split(",") if label]
+
+
+# `@data(n)` needs the number of databases when the module is imported. The
+# node sets the labels the user requested for the task, so every requested
+# database is loaded in a single container run.
+REQUESTED_DATABASES = max(1, len(_requested_database_labels()))
+
+
+@data(REQUESTED_DATABASES)
 def get_unique_event_times(
-    df: pd.DataFrame,
+    *dfs: pd.DataFrame,
     noise_type: NoiseType = NoiseType.NONE,
     snr: Optional[float] = None,
     random_seed: Optional[int] = None,
-) -> List[float]:
+    noise_configurations: Optional[List[Dict]] = None,
+) -> Union[List[float], List[List[float]]]:
     """
-    Preprocess the data and collect unique event times from the standardized columns.
+    Preprocess the data and collect unique event times from the standardized columns
+    of all databases on this node.
+
+    With `noise_configurations` (a list of dicts with `noise_type`, `snr` and `random_seed`),
+    the data is preprocessed once and one list of unique event times is returned per
+    configuration.
     """
     info("Starting get_unique_event_times task.")
-    info("Running preprocessing on input data for unique event times.")
-    df = strata_fit_data_to_km_input(df)
-    info(f"Preprocessing complete. Processed {df.shape[0]} rows.")
-
-    # Apply noise to both time columns.
-    info("Adding noise to interval start column.")
-    df = add_noise_to_event_times(df, DEFAULT_INTERVAL_START_COLUMN, noise_type, snr, random_seed)
-    info("Adding noise to interval end column.")
-    df = add_noise_to_event_times(df, DEFAULT_INTERVAL_END_COLUMN, noise_type, snr, random_seed)
-
-    unique_times = pd.concat([
-        df[DEFAULT_INTERVAL_START_COLUMN],
-        df[DEFAULT_INTERVAL_END_COLUMN]
-    ]).dropna().unique()
-    info(f"Collected {len(unique_times)} unique event times.")
+    dfs = _preprocess_databases(dfs)
 
-    return unique_times.tolist()
+    if noise_configurations is None:
+        return _unique_event_times(_add_noise(dfs, noise_type, snr, random_seed))
+    info(f"Collecting unique event times for {len(noise_configurations)} noise configurations.")
+    return [_unique_event_times(_add_noise(dfs, **_noise_kwargs(config))) for config in noise_configurations]
 
 
-@data(1)
+@data(REQUESTED_DATABASES)
 def get_km_event_table(
-    df: pd.DataFrame,
-    unique_event_times: List[float],
+    *dfs: pd.DataFrame,
+    unique_event_times: Union[List[float], List[List[float]]],
     noise_type: NoiseType = NoiseType.NONE,
     snr: Optional[float] = None,
     random_seed: Optional[int] = None,
-) -> str:
+    per_database: bool = False,
+    noise_configurations: Optional[List[Dict]] = None,
+) -> Union[str, Dict[str, str], List[Union[str, Dict[str, str]]]]:
     """
     Preprocess the data and generate an event table for Kaplan-Meier calculation with interval censoring.
+
+    With `per_database` set, a dict with one event table per database label is returned;
+    otherwise the counts of all databases are pooled into a single table.
+
+    With `noise_configurations`, `unique_event_times` holds one list per configuration and
+    the result for each configuration is returned in the same order.
     """
     info("Starting get_km_event_table task.")
-    info("Running preprocessing on input data for KM event table.")
-    df = strata_fit_data_to_km_input(df)
-    info(f"Preprocessing complete. Processed {df.shape[0]} rows.")
+    dfs = _preprocess_databases(dfs)
+
+    if noise_configurations is None:
+        return _event_tables(_add_noise(dfs, noise_type, snr, random_seed), unique_event_times, per_database)
+    if len(unique_event_times) != len(noise_configurations):
+        raise InputError("Expected one list of unique event times per noise configuration.")
+    info(f"Constructing event tables for {len(noise_configurations)} noise configurations.")
+    return [
+        _event_tables(_add_noise(dfs, **_noise_kwargs(config)), times, per_database)
+        for config, times in zip(noise_configurations, unique_event_times)
+    ]
 
-    info("Adding noise to interval start column for KM event table.")
-    df = add_noise_to_event_times(df, DEFAULT_INTERVAL_START_COLUMN, noise_type, snr, random_seed)
-    info("Adding noise to interval end column for KM event table.")
-    df = add_noise_to_event_times(df, DEFAULT_INTERVAL_END_COLUMN, noise_type, snr, random_seed)
 
+def _label_databases(dfs: tuple) -> Dict[str, pd.DataFrame]:
+    """
+    Key the databases by the labels requested for the task, in label order.
+
+    On a node, `@data` prepends every database it loads to the arguments, so the
+    function receives them in reverse label order. Mock data is passed in order and
+    the mock client sets no labels, so it is keyed by position ("0", "1", ...).
+    """
+    labels = _requested_database_labels()
+    if len(labels) == len(dfs):
+        return dict(zip(labels, reversed(dfs)))
+    return {str(i): df for i, df in enumerate(dfs)}
+
+
+def _preprocess_databases(dfs: tuple) -> Dict[str, pd.DataFrame]:
+    """
+    Run preprocessing on every database, keyed by database label.
+    """
+    if not dfs:
+        raise InputError("No database was provided to the partial task.")
+
+    processed = {}
+    for label, df in _label_databases(dfs).items():
+        info(f"Running preprocessing on input data of database '{label}'.")
+        df = strata_fit_data_to_km_input(df)
+        info(f"Preprocessing complete. Processed {df.shape[0]} rows.")
+        processed[label] = df
+    return processed
+
+
+def _noise_kwargs(config: Dict) -> Dict:
+    return {
+        "noise_type": config.get("noise_type", NoiseType.NONE),
+        "snr": config.get("snr"),
+        "random_seed": config.get("random_seed"),
+    }
+
+
+def _add_noise(
+    dfs: Dict[str, pd.DataFrame],
+    noise_type: NoiseType,
+    snr: Optional[float],
+    random_seed: Optional[int],
+) -> Dict[str, pd.DataFrame]:
+    """
+    Add noise to both time columns of every database. The preprocessed tables are
+    copied, so they can be reused for other noise configurations.
+    """
+    # The databases are noised as one frame, with the database index kept to split them
+    # back. Seeding once gives every record its own perturbation (seeding per database
+    # would repeat the same noise vector in each), and the Gaussian scale comes from the
+    # node's pooled data, so pooling the noised tables equals noising the pooled data.
+    # `concat` may share memory with a single input, so copy explicitly.
+    combined = pd.concat(list(dfs.values()), keys=range(len(dfs)), names=["database", None]).copy()
+    info("Adding noise to interval start column.")
+    combined = add_noise_to_event_times(combined, DEFAULT_INTERVAL_START_COLUMN, noise_type, snr, random_seed)
+    info("Adding noise to interval end column.")
+    combined = add_noise_to_event_times(combined, DEFAULT_INTERVAL_END_COLUMN, noise_type, snr, random_seed)
+    return {label: combined.xs(i, level="database") for i, label in enumerate(dfs)}
+
+
+def _unique_event_times(dfs: Dict[str, pd.DataFrame]) -> List[float]:
+    unique_times = pd.concat(
+        [df[DEFAULT_INTERVAL_START_COLUMN] for df in dfs.values()]
+        + [df[DEFAULT_INTERVAL_END_COLUMN] for df in dfs.values()]
+    ).dropna().unique()
+    info(f"Collected {len(unique_times)} unique event times.")
+    return unique_times.tolist()
+
+
+def _event_tables(
+    dfs: Dict[str, pd.DataFrame],
+    unique_event_times: List[float],
+    per_database: bool,
+) -> Union[str, Dict[str, str]]:
+    if per_database:
+        return {label: _event_table(df, unique_event_times).to_json() for label, df in dfs.items()}
+    return _event_table(pd.concat(list(dfs.values()), ignore_index=True), unique_event_times).to_json()
+
+
+def _event_table(df: pd.DataFrame, unique_event_times: List[float]) -> pd.DataFrame:
+    """
+    Count exact, right-censored and interval-censored events at the unique event times.
+    """
     info("Constructing event table based on unique event times.")
     event_table = (
         pd.DataFrame(index=sorted(unique_event_times))
@@ -102,4 +205,4 @@ def get_km_event_table(
     event_table["at_risk"] = event_table["removed"].iloc[::-1].cumsum().iloc[::-1]
     info("Event table constructed successfully with at-risk counts computed.")
 
-    return event_table.to_json()
+    return event_table
@@ -10,6 +10,11 @@ class NoiseType(str, Enum):
     GAUSSIAN = "GAUSSIAN"
     POISSON = "POISSON"
 
+class ResultFormat(str, Enum):
+    TABLE = "TABLE"
+    CURVE = "CURVE"
+    LANDMARKS = "LANDMARKS"
+
 # Hyperparameters for column names.
 # After preprocessing, the survival data will always have these standardized column names.
 DEFAULT_INTERVAL_START_COLUMN = "interval_start"
@@ -39,7 +39,10 @@ def apply_gaussian_noise(df: pd.DataFrame, time_column_name: str, snr: float | N
 
 def apply_poisson_noise(df: pd.DataFrame, time_column_name: str) -> pd.DataFrame:
     info("Applying Poisson noise.")
-    df[time_column_name] = df[time_column_name].apply(
-        lambda x: np.random.poisson(lam=x) if x > 0 else 0
-    )
+    # Draw only for positive times, in row order, so seeded results match a per-row loop.
+    times = df[time_column_name].to_numpy()
+    positive = times > 0
+    noisy = np.zeros(len(times), dtype=np.int64)
+    noisy[positive] = np.random.poisson(lam=times[positive])
+    df[time_column_name] = noisy
     return df
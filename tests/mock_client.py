@@ -1,5 +1,6 @@
 import warnings
 import os
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
@@ -7,7 +8,13 @@ from vantage6.algorithm.tools.mock_client import MockAlgorithmClient
 
 warnings.filterwarnings("ignore")
 
-from strata_fit_v6_km_py.types import DEFAULT_INTERVAL_START_COLUMN, DEFAULT_CUMULATIVE_INCIDENCE_COLUMN
+from vantage6.algorithm.tools.exceptions import InputError
+
+from strata_fit_v6_km_py.types import NoiseType, DEFAULT_INTERVAL_START_COLUMN, DEFAULT_CUMULATIVE_INCIDENCE_COLUMN
+from strata_fit_v6_km_py.central import _validate_noise_configurations
+from strata_fit_v6_km_py.curve import KaplanMeierCurve
+from strata_fit_v6_km_py.partial import _add_noise, _label_databases, _preprocess_databases
+from strata_fit_v6_km_py.utils import add_noise_to_event_times
 
 def plot_km_curve(df_km):
     import matplotlib.pyplot as plt
@@ -68,10 +75,150 @@ print("Summary statistics:")
 # print(df_km[["at_risk", "observed", "censored", "interval", "hazard", DEFAULT_CUMULATIVE_INCIDENCE_COLUMN]].describe())
 print(df_km.describe())
 
+# Landmarks (1/2/5/10 years) and median time, from the compact step function.
+# Pass "result_format": "LANDMARKS" with "landmark_times" to get only this summary from the central.
+curve = KaplanMeierCurve.from_result(results_json)
+print("\nCumulative incidence at 1/2/5/10 years:", curve([12, 24, 60, 120]))
+print("Median time to D2T-RA (months):", curve.median())
+
 # Example assertion (ensure we have at least one time‐point and survival_cdf is ≤1):
 assert not df_km.empty
 assert df_km[DEFAULT_CUMULATIVE_INCIDENCE_COLUMN].max() <= 1.0
 
+def run_central(mock_client, **kwargs):
+    task = mock_client.task.create(
+        input_={"method": "kaplan_meier_central", "kwargs": {"organizations_to_include": org_ids, **kwargs}},
+        organizations=[org_ids[0]],
+    )
+    return mock_client.result.get(task["id"])
+
+# --- 6. Multiple databases per node ---
+# Every node also hosts a small second cohort (visits in the first two years), so the
+# second database has times at which nobody is at risk. The mock client sets no database
+# labels, so the databases are keyed by position.
+node_frames = [pd.read_csv(dataset["database"]) for dataset in [dataset1, dataset2, dataset3]]
+small_frames = [df[df["Visit_months_from_diagnosis"] < 24] for df in node_frames]
+multi_client = MockAlgorithmClient(
+    datasets=[[{"database": big.copy()}, {"database": small.copy()}] for big, small in zip(node_frames, small_frames)],
+    organization_ids=org_ids,
+    module="strata_fit_v6_km_py"
+)
+multi_result = run_central(multi_client, per_database=True)
+assert list(multi_result["per_database"]) == ["0", "1"]
+
+# The pooled table equals a run on one concatenated database per node
+# (patient IDs are prefixed, as they are only unique within a cohort).
+concat_client = MockAlgorithmClient(
+    datasets=[
+        [{"database": pd.concat([big.assign(pat_ID="A" + big["pat_ID"]), small.assign(pat_ID="B" + small["pat_ID"])])}]
+        for big, small in zip(node_frames, small_frames)
+    ],
+    organization_ids=org_ids,
+    module="strata_fit_v6_km_py"
+)
+pd.testing.assert_frame_equal(pd.read_json(multi_result["pooled"]), pd.read_json(run_central(concat_client)))
+
+# The first database holds the original datasets, so its curve equals the run above
+# at that run's times (the small cohorts only add times without events to the shared grid).
+df_first = pd.read_json(multi_result["per_database"]["0"])
+df_first = df_first[df_first[DEFAULT_INTERVAL_START_COLUMN].isin(df_km[DEFAULT_INTERVAL_START_COLUMN])]
+pd.testing.assert_frame_equal(df_first.reset_index(drop=True), df_km)
+
+# Times beyond the small cohorts have nobody at risk: hazard 0, cumulative incidence flat.
+df_small = pd.read_json(multi_result["per_database"]["1"])
+no_risk = df_small["at_risk"] == 0
+assert no_risk.any() and not df_small["hazard"].isna().any()
+assert (df_small.loc[no_risk, "hazard"] == 0).all()
+assert df_small.loc[no_risk, DEFAULT_CUMULATIVE_INCIDENCE_COLUMN].nunique() == 1
+
+# Databases on one node are noised together, so duplicated records get different noise.
+base = _preprocess_databases((node_frames[0].copy(),))["0"]
+noisy_a, noisy_b = _add_noise({"a": base, "b": base}, "GAUSSIAN", 2, 5).values()
+assert not np.array_equal(noisy_a[DEFAULT_INTERVAL_START_COLUMN].values, noisy_b[DEFAULT_INTERVAL_START_COLUMN].values)
+
+# On a node, `@data` passes the databases in reverse order of the requested labels.
+os.environ["USER_REQUESTED_DATABASE_LABELS"] = "registry,early_ra"
+labelled = _label_databases((small_frames[0], node_frames[0]))
+del os.environ["USER_REQUESTED_DATABASE_LABELS"]
+assert list(labelled) == ["registry", "early_ra"] and labelled["registry"] is node_frames[0]
+print("Multiple databases per node checked.")
+
+# --- 7. Noise parameter sweeps ---
+# Every configuration of a sweep equals the corresponding single run.
+sweep = [
+    {"noise_type": "NONE"},
+    {"name": "gaussian", "noise_type": "GAUSSIAN", "snr": 10, "random_seed": 1},
+    {"noise_type": "POISSON", "random_seed": 1},
+]
+sweep_results = run_central(client, noise_configurations=sweep)
+assert list(sweep_results) == ["NONE_snr=None_seed=None", "gaussian", "POISSON_snr=None_seed=1"]
+assert sweep_results["NONE_snr=None_seed=None"] == results_json
+assert sweep_results["gaussian"] == run_central(client, noise_type="GAUSSIAN", snr=10, random_seed=1)
+assert sweep_results["POISSON_snr=None_seed=1"] == run_central(client, noise_type="POISSON", random_seed=1)
+
+# Top-level noise arguments cannot be combined with a sweep.
+try:
+    run_central(client, noise_type="GAUSSIAN", snr=10, noise_configurations=sweep)
+    raise AssertionError("Expected an InputError.")
+except InputError:
+    pass
+
+# Invalid configurations are rejected at the central, before any partial task is created.
+for invalid in (["GAUSSIAN"], [{"noise_type": "GAUSSIAN"}], [{"noise_type": "GAUSSIAN", "snr": 0}]):
+    try:
+        _validate_noise_configurations(invalid)
+        raise AssertionError("Expected an InputError.")
+    except InputError:
+        pass
+
+# Seeded Poisson noise draws the same values as a per-row apply.
+times = pd.DataFrame({DEFAULT_INTERVAL_START_COLUMN: [0.0, 3.2, np.nan, 12.5, -1.0, 40.1]})
+np.random.seed(7)
+expected = times[DEFAULT_INTERVAL_START_COLUMN].apply(lambda x: np.random.poisson(lam=x) if x > 0 else 0)
+noisy = add_noise_to_event_times(times.copy(), DEFAULT_INTERVAL_START_COLUMN, NoiseType.POISSON, None, 7)
+assert np.array_equal(noisy[DEFAULT_INTERVAL_START_COLUMN].values, expected.values)
+print("Noise parameter sweeps checked.")
+
+# --- 8. Compact curve and landmark results ---
+# Querying at the steps returns their values (right-continuous); zero before the first step.
+assert np.array_equal(curve(curve.times), curve.cumulative_incidence)
+assert curve(curve.times[0] - 1) == 0.0
+assert isinstance(curve(12), float) and curve([12, 24]).shape == (2,)
+assert np.isnan(curve.quantile(1.1)) and curve.quantile(0) == 0.0 and curve.quantile(-0.5) == 0.0
+assert curve(curve.median()) >= 0.5
+
+# Only the rows at which the cumulative incidence changes are kept.
+assert len(curve) == (df_km[DEFAULT_CUMULATIVE_INCIDENCE_COLUMN].diff() != 0).sum()
+assert np.allclose(curve(df_km[DEFAULT_INTERVAL_START_COLUMN]), df_km[DEFAULT_CUMULATIVE_INCIDENCE_COLUMN])
+
+# NaN times and quantiles stay NaN.
+assert np.isnan(curve(np.nan)) and np.isnan(curve([np.nan, 12])[0])
+assert np.isnan(curve.quantile(np.nan)) and np.isnan(curve.quantile([np.nan, 0.5])[0])
+
+# An empty curve has no incidence and never reaches any positive quantile.
+empty = KaplanMeierCurve([], [])
+assert empty(5.0) == 0.0 and np.isnan(empty(np.nan))
+assert np.isnan(empty.median()) and empty.quantile(0) == 0.0
+
+# A decreasing cumulative incidence is rejected.
+try:
+    KaplanMeierCurve([1, 2], [0.5, 0.2])
+    raise AssertionError("Expected a ValueError.")
+except ValueError:
+    pass
+
+# The central's compact results match the curve built from the full table
+# (up to the rounding of the JSON table).
+compact = KaplanMeierCurve.from_result(run_central(client, result_format="CURVE"))
+assert np.array_equal(compact.times, curve.times)
+assert np.allclose(compact.cumulative_incidence, curve.cumulative_incidence)
+landmarks = run_central(client, result_format="LANDMARKS", landmark_times=[12, 24, 60, 120], quantiles=[0.5, 1.1])
+expected = curve.landmarks([12, 24, 60, 120], [0.5, 1.1])
+assert np.allclose(landmarks["cumulative_incidence"], expected["cumulative_incidence"])
+assert landmarks["quantile_times"] == expected["quantile_times"]
+assert landmarks["quantile_times"][1] is None
+print("Compact curve and landmark results checked.")
+
 # plotting
 plot_km_curve(df_km)
 
@@ -0,0 +1,320 @@
+"""
+Vectorized generators for synthetic STRATA-FIT test data.
+
+- `generate_event_times`: interval survival data (`interval_start`,
+  `interval_end`, `event_type`).
+- `reverse_engineer_strata_fit`: minimal raw STRATA-FIT visits that
+  reproduce a given set of interval survival data.
+- `generate_registry`: realistic longitudinal registries with many visits
+  per patient, DMARD switching, DAS28 trajectories and pre-2006 diagnoses
+  (to exercise the clipping in preprocessing).
+
+Registries can be written straight to chunked CSV or Parquet, one file per
+organization, so multi-million-visit datasets never have to fit in memory:
+    python tests/synthetic_data.py --patients 1000000 --organizations 3 --format parquet
+"""
+
+import argparse
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+STRATA_FIT_COLUMNS = [
+    "pat_ID", "Visit_months_from_diagnosis", "D2T_RA", "Age_diagnosis", "Sex",
+    "RF_positivity", "anti_CCP", "CRP", "ESR", "SJC28", "TJC28",
+    "csDMARD1", "csDMARD2", "csDMARD3", "conc_MTX_dose", "N_prev_csDMARD",
+    "bDMARD", "N_prev_bDMARD", "tsDMARD", "N_prev_tsDMARD",
+    "GC", "GC_type", "GC_dose", "eq5d", "HAQ", "Year_diagnosis",
+    "Symptom_duration", "DAS28", "Pat_global", "Ph_global",
+]
+
+# Dummy static values used when reverse engineering interval survival data.
+DUMMY_VALUES = {
+    "Age_diagnosis": 50, "Sex": 1, "RF_positivity": 0, "anti_CCP": 0,
+    "CRP": 1.0, "ESR": 10, "SJC28": 2, "TJC28": 3,
+    "csDMARD1": 0, "csDMARD2": 0, "csDMARD3": 0, "conc_MTX_dose": 15.0,
+    "N_prev_csDMARD": 0, "bDMARD": 0, "N_prev_bDMARD": 0, "tsDMARD": 0,
+    "N_prev_tsDMARD": 0, "GC": 0, "GC_type": 1, "GC_dose": 5.0,
+    "eq5d": 0.8, "HAQ": 1.0, "Year_diagnosis": 2015, "Symptom_duration": 12.0,
+}
+EVENT_VALUES = {
+    "bDMARD": 1, "tsDMARD": 1, "csDMARD1": 1,
+    "DAS28": 4.0, "Pat_global": 60.0, "Ph_global": 60.0,
+}
+
+# Advanced therapy classes: codes 1-5 are bDMARDs, 6-7 tsDMARDs. The codes
+# share one space so that `compute_unique_dmards` counts distinct classes.
+N_BDMARD_CLASSES = 5
+N_THERAPY_CLASSES = 7
+
+
+def generate_event_times(
+    n: int,
+    seed: Optional[int] = 42,
+    max_start: float = 50.0,
+    max_increment: float = 10.0,
+    probs: tuple = (0.6, 0.3, 0.1),
+) -> pd.DataFrame:
+    """
+    Generate interval survival data. Exact and censored rows have
+    `interval_end == interval_start`; interval-censored rows end up to
+    `max_increment` months later.
+    """
+    rng = np.random.default_rng(seed)
+    interval_start = np.round(rng.uniform(0, max_start, size=n), 2)
+    event_type = rng.choice(["exact", "censored", "interval"], size=n, p=list(probs))
+    increment = np.round(rng.uniform(0.01, max_increment, size=n), 2)
+    interval_end = np.where(event_type == "interval", np.round(interval_start + increment, 2), interval_start)
+    return pd.DataFrame({
+        "interval_start": interval_start,
+        "interval_end": interval_end,
+        "event_type": event_type,
+    })
+
+
+def reverse_engineer_strata_fit(suv_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Reverse-engineer a raw STRATA-FIT-style longitudinal dataset from interval
+    survival data with columns ['interval_start', 'interval_end', 'event_type'].
+
+    Interval-censored rows become a pre-event visit at `interval_start` and an
+    event visit at `interval_end`; exact and censored rows become a single
+    visit at `interval_end`, flagged as an event only when exact.
+    """
+    suv_df = suv_df.reset_index(drop=True)
+    etype = suv_df["event_type"].to_numpy()
+    is_interval = etype == "interval"
+
+    # Interval rows are repeated: the first copy is the pre-event visit.
+    rows = np.repeat(np.arange(len(suv_df)), 1 + is_interval)
+    first_copy = np.r_[True, rows[1:] != rows[:-1]]
+    pre_event = first_copy & is_interval[rows]
+
+    times = np.where(pre_event, suv_df["interval_start"].to_numpy()[rows], suv_df["interval_end"].to_numpy()[rows])
+    is_event = ~pre_event & np.isin(etype[rows], ["interval", "exact"])
+
+    raw = pd.DataFrame({
+        "pat_ID": "SE" + pd.Series(rows + 1).astype(str),
+        "Visit_months_from_diagnosis": np.round(times, 2),
+        "D2T_RA": is_event,
+    })
+    for column, value in DUMMY_VALUES.items():
+        raw[column] = value
+    for column, value in EVENT_VALUES.items():
+        dummy = DUMMY_VALUES.get(column, np.nan)
+        raw[column] = np.where(is_event, value, dummy)
+    return raw
+
+
+def _within_patient_cumsum(values: np.ndarray, offsets: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Cumulative sum of `values` restarting at every patient boundary."""
+    total = np.cumsum(values)
+    before = total[offsets] - values[offsets]
+    return total - np.repeat(before, counts)
+
+
+def generate_registry(
+    n_patients: int,
+    seed: Optional[int] = 42,
+    mean_visits: float = 12.0,
+    mean_visit_interval: float = 6.0,
+    pre_2006_fraction: float = 0.2,
+    missing_rate: float = 0.05,
+    id_prefix: str = "SY",
+    first_id: int = 1,
+) -> pd.DataFrame:
+    """
+    Generate a raw STRATA-FIT registry with one row per visit.
+
+    Each patient has a latent refractoriness that sets their DAS28 plateau
+    (an exponential decay from a high baseline) and how eagerly they switch
+    advanced therapy while DAS28 stays above 3.2. Patients diagnosed before
+    2006 get extra follow-up so part of it falls before the 2006 clip.
+
+    Parameters:
+        n_patients (int): Number of patients to generate.
+        seed (int): Seed for `numpy.random.default_rng`.
+        mean_visits (float): Mean number of visits per patient (post-2006).
+        mean_visit_interval (float): Mean months between visits.
+        pre_2006_fraction (float): Share of patients diagnosed before 2006.
+        missing_rate (float): Share of DAS28 / global scores left missing.
+        id_prefix (str), first_id (int): Patients are named `{prefix}{id}`.
+
+    Returns:
+        pd.DataFrame: Visits with the columns in `STRATA_FIT_COLUMNS`.
+    """
+    if n_patients <= 0:
+        return pd.DataFrame(columns=STRATA_FIT_COLUMNS)
+    rng = np.random.default_rng(seed)
+    n = n_patients
+
+    # Patient level
+    pre_2006 = rng.random(n) < pre_2006_fraction
+    year_diagnosis = np.where(pre_2006, rng.integers(1990, 2006, n), rng.integers(2006, 2023, n))
+    refractory = rng.beta(2, 5, n)
+    baseline_das = rng.normal(5.2, 0.8, n)
+    plateau_das = 2.0 + 3.5 * refractory
+    therapy_start = rng.integers(0, N_THERAPY_CLASSES, n)
+
+    n_visits = 1 + rng.poisson(mean_visits - 1, n) + 2 * np.maximum(2006 - year_diagnosis, 0)
+    offsets = np.concatenate([[0], np.cumsum(n_visits)[:-1]])
+    pid = np.repeat(np.arange(n), n_visits)
+    m = len(pid)
+
+    # Visit times and DAS28 trajectories
+    gaps = rng.gamma(2.0, mean_visit_interval / 2.0, m)
+    gaps[offsets] = rng.uniform(0, 3, n)
+    months = np.round(_within_patient_cumsum(gaps, offsets, n_visits), 2)
+    das28 = (
+        plateau_das[pid]
+        + (baseline_das - plateau_das)[pid] * np.exp(-months / 12.0)
+        + rng.normal(0, 0.5, m)
+    ).clip(0.5, 9.4)
+    active = das28 > 3.2
+
+    # Advanced therapy lines: switch while active disease persists.
+    switch = active & (rng.random(m) < 0.1 + 0.4 * refractory[pid])
+    switch[offsets] = False
+    line = np.minimum(_within_patient_cumsum(switch.astype(int), offsets, n_visits), N_THERAPY_CLASSES)
+    code = (therapy_start[pid] + line - 1) % N_THERAPY_CLASSES + 1
+    on_b = (line > 0) & (code <= N_BDMARD_CLASSES)
+    on_ts = (line > 0) & (code > N_BDMARD_CLASSES)
+
+    # Previous b/tsDMARD exposures per line, tabulated per patient.
+    line_codes = (therapy_start[:, None] + np.arange(N_THERAPY_CLASSES)) % N_THERAPY_CLASSES + 1
+    prev_b = np.hstack([np.zeros((n, 1), int), np.cumsum(line_codes <= N_BDMARD_CLASSES, axis=1)])
+    prev_line = np.maximum(line - 1, 0)
+    n_prev_b = prev_b[pid, prev_line]
+    n_prev_ts = prev_line - n_prev_b
+
+    pat_global = (das28 * 12 + rng.normal(0, 10, m)).clip(0, 100).round()
+    ph_global = (das28 * 11 + rng.normal(0, 8, m)).clip(0, 100).round()
+    mtx = rng.random(m) < 0.8
+    gc = (das28 > 5.1) & (rng.random(m) < 0.6)
+
+    df = pd.DataFrame({
+        "pat_ID": id_prefix + pd.Series(pid + first_id).astype(str),
+        "Visit_months_from_diagnosis": months,
+        "D2T_RA": (line >= 2) & active & ((pat_global > 50) | (ph_global > 50)),
+        "Age_diagnosis": rng.normal(55, 13, n).clip(18, 90).round()[pid],
+        "Sex": rng.integers(0, 2, n)[pid],
+        "RF_positivity": (rng.random(n) < 0.6)[pid].astype(int),
+        "anti_CCP": (rng.random(n) < 0.6)[pid].astype(int),
+        "CRP": np.round(np.exp(rng.normal(0.4 * das28 - 0.5, 0.6)), 1),
+        "ESR": np.round(np.exp(rng.normal(0.35 * das28 + 1.0, 0.4))),
+        "SJC28": rng.binomial(28, (das28 / 20).clip(0, 1)),
+        "TJC28": rng.binomial(28, (das28 / 16).clip(0, 1)),
+        "csDMARD1": mtx.astype(int),
+        "csDMARD2": (rng.random(m) < 0.2).astype(int),
+        "csDMARD3": (rng.random(m) < 0.05).astype(int),
+        "conc_MTX_dose": np.where(mtx, rng.choice([10.0, 15.0, 20.0, 25.0], m), 0.0),
+        "N_prev_csDMARD": rng.integers(0, 3, n)[pid],
+        "bDMARD": np.where(on_b, code, np.nan),
+        "N_prev_bDMARD": n_prev_b,
+        "tsDMARD": np.where(on_ts, code, np.nan),
+        "N_prev_tsDMARD": n_prev_ts,
+        "GC": gc.astype(int),
+        "GC_type": 1,
+        "GC_dose": np.where(gc, rng.choice([2.5, 5.0, 7.5, 10.0], m), 0.0),
+        "eq5d": (0.95 - 0.07 * das28 + rng.normal(0, 0.08, m)).clip(-0.3, 1).round(3),
+        "HAQ": (0.3 * das28 - 0.5 + rng.normal(0, 0.3, m)).clip(0, 3).round(3),
+        "Year_diagnosis": year_diagnosis[pid],
+        "Symptom_duration": rng.gamma(2.0, 6.0, n).round(1)[pid],
+        "DAS28": das28.round(2),
+        "Pat_global": pat_global,
+        "Ph_global": ph_global,
+    })
+    for column in ["DAS28", "Pat_global", "Ph_global"]:
+        df.loc[rng.random(m) < missing_rate, column] = np.nan
+    return df
+
+
+def generate_registry_chunks(
+    n_patients: int,
+    chunk_size: int = 100_000,
+    seed: Union[int, np.random.SeedSequence, None] = 42,
+    **kwargs,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a registry of `n_patients` in chunks of at most `chunk_size`
+    patients. Every chunk gets its own child seed, so the output only depends
+    on `seed` and `chunk_size`.
+    """
+    n_chunks = -(-n_patients // chunk_size)
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = root.spawn(n_chunks)
+    for i, chunk_seed in enumerate(seeds):
+        first = i * chunk_size
+        size = min(chunk_size, n_patients - first)
+        yield generate_registry(size, seed=chunk_seed, first_id=first + 1, **kwargs)
+
+
+def write_registry(
+    chunks: Iterator[pd.DataFrame],
+    path: Path,
+    file_format: str = "csv",
+) -> int:
+    """
+    Stream registry chunks into a single CSV or Parquet file. Returns the
+    number of visits written.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    n_rows = 0
+    if file_format == "csv":
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+            n_rows += len(chunk)
+    elif file_format == "parquet":
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(path, table.schema)
+                writer.write_table(table)
+                n_rows += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        raise ValueError(f"Unknown file format: {file_format}")
+    return n_rows
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--patients", type=int, default=10_000, help="Patients per organization.")
+    parser.add_argument("--organizations", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--chunk-size", type=int, default=100_000, help="Patients generated per chunk.")
+    parser.add_argument("--mean-visits", type=float, default=12.0)
+    parser.add_argument("--pre-2006-fraction", type=float, default=0.2)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--output-dir", type=Path, default=Path("tests/data/synthetic"))
+    args = parser.parse_args(argv)
+    for name in ["patients", "organizations", "chunk_size"]:
+        if getattr(args, name) < 1:
+            parser.error(f"--{name.replace('_', '-')} must be at least 1.")
+
+    org_seeds = np.random.SeedSequence(args.seed).spawn(args.organizations)
+    for org, org_seed in enumerate(org_seeds):
+        path = args.output_dir / f"org_{org}.{args.format}"
+        chunks = generate_registry_chunks(
+            args.patients,
+            chunk_size=args.chunk_size,
+            seed=org_seed,
+            mean_visits=args.mean_visits,
+            pre_2006_fraction=args.pre_2006_fraction,
+            id_prefix=f"O{org}P",
+        )
+        n_rows = write_registry(chunks, path, args.format)
+        print(f"Wrote {n_rows} visits for {args.patients} patients to {path}.")
+
+
+if __name__ == "__main__":
+    main()